@@ -28,4 +28,10 @@ async def main() -> None:
                 sys.stdout.write(event.data.get("data", ""))
 
 
-asyncio.run(main())
+# Optional: run on uvloop when it is installed (pip install uvloop).
+try:
+    import uvloop
+except ImportError:
+    asyncio.run(main())
+else:
+    uvloop.run(main())
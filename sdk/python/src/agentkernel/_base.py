@@ -0,0 +1,89 @@
+"""State and request handling shared by the sync and async clients."""
+
+from __future__ import annotations
+
+from typing import Any, Generic, TypeVar
+
+import httpx
+
+from ._config import DEFAULT_LIMITS, HTTP2_AVAILABLE, Config, build_url
+from ._json import dumps
+from .errors import AgentKernelError, error_from_status
+from .types import BatchRunResponse, Envelope, FileReadResponse, RunOutput, SandboxInfo, T
+
+SDK_VERSION = "0.4.0"
+
+_JSON_CONTENT_TYPE = (b"Content-Type", b"application/json")
+
+HttpClientT = TypeVar("HttpClientT", httpx.Client, httpx.AsyncClient)
+
+# Parametrize the response envelopes once: each Envelope[X] subscript is a
+# generic-cache lookup that costs more than decoding a small response.
+StrEnvelope = Envelope[str]
+LogsEnvelope = Envelope[list[dict[str, Any]]]
+RunOutputEnvelope = Envelope[RunOutput]
+SandboxInfoEnvelope = Envelope[SandboxInfo]
+SandboxListEnvelope = Envelope[list[SandboxInfo]]
+FileReadEnvelope = Envelope[FileReadResponse]
+BatchRunEnvelope = Envelope[BatchRunResponse]
+
+# Call pydantic-core directly where models are built one at a time: it skips
+# the Python-level BaseModel.__init__ / model_validate_json wrapper frames.
+validate_run_output = RunOutput.__pydantic_validator__.validate_python
+
+
+def http_options(config: Config) -> dict[str, Any]:
+    """Keyword arguments for the underlying httpx client."""
+    headers: dict[str, str] = {"User-Agent": f"agentkernel-python-sdk/{SDK_VERSION}"}
+    if config.api_key:
+        headers["Authorization"] = f"Bearer {config.api_key}"
+    return {
+        "base_url": config.base_url,
+        "headers": headers,
+        "timeout": config.timeout,
+        "limits": DEFAULT_LIMITS,
+        "http2": HTTP2_AVAILABLE,
+    }
+
+
+class BaseClient(Generic[HttpClientT]):
+    """Builds requests and decodes responses; subclasses only do the I/O."""
+
+    __slots__ = ("_base_url", "_http", "_headers", "_json_headers", "_extensions", "__weakref__")
+
+    _http: HttpClientT
+
+    def __init__(self, config: Config, http: HttpClientT) -> None:
+        self._base_url = config.base_url
+        self._http = http
+        # Headers and timeout never change per request, so encode them once
+        # and build requests directly rather than merging via build_request().
+        self._headers = http.headers.raw
+        self._json_headers = [*self._headers, _JSON_CONTENT_TYPE]
+        self._extensions = {"timeout": http.timeout.as_dict()}
+
+    def _build_request(
+        self, method: str, path: str, payload: dict[str, Any] | None = None
+    ) -> httpx.Request:
+        url = build_url(self._base_url, path)
+        if payload is None:
+            return httpx.Request(method, url, headers=self._headers, extensions=self._extensions)
+        return httpx.Request(
+            method,
+            url,
+            headers=self._json_headers,
+            content=dumps(payload),
+            extensions=self._extensions,
+        )
+
+    def _check_status(self, response: httpx.Response) -> None:
+        if response.status_code >= 400:
+            raise error_from_status(response.status_code, response.content)
+
+    def _parse_response(self, response: httpx.Response, envelope: type[Envelope[T]]) -> T:
+        self._check_status(response)
+        parsed: Envelope[T] = envelope.__pydantic_validator__.validate_json(response.content)
+        if not parsed.success:
+            raise AgentKernelError(parsed.error or "Unknown error")
+        # A successful envelope always carries data of the requested type.
+        return parsed.data  # type: ignore[return-value]
@@ -2,11 +2,24 @@
 
 from __future__ import annotations
 
+import importlib.util
 import os
 from dataclasses import dataclass
+from functools import lru_cache
+
+import httpx
 
 DEFAULT_BASE_URL = "http://localhost:18888"
+UDS_BASE_URL = "http://localhost"
 DEFAULT_TIMEOUT = 30.0
+DEFAULT_LIMITS = httpx.Limits(
+    max_keepalive_connections=64,
+    max_connections=128,
+    keepalive_expiry=60.0,
+)
+
+# HTTP/2 needs the optional `h2` package (the `http2` extra).
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 
 @dataclass(frozen=True)
@@ -14,16 +27,33 @@ class Config:
     base_url: str
     api_key: str | None
     timeout: float
+    uds: str | None = None
 
 
 def resolve_config(
     base_url: str | None = None,
     api_key: str | None = None,
     timeout: float | None = None,
+    uds: str | None = None,
 ) -> Config:
-    """Resolve config from constructor args > env vars > defaults."""
+    """Resolve config from constructor args > env vars > defaults.
+
+    When a Unix-domain socket is configured and no base URL is given, requests
+    go to ``http://localhost`` over the socket instead of TCP. The API server
+    itself only listens on TCP, so the socket must be served by an HTTP proxy
+    in front of it.
+    """
+    uds = uds or os.environ.get("AGENTKERNEL_UDS")
+    base_url = base_url or os.environ.get("AGENTKERNEL_BASE_URL")
     return Config(
-        base_url=(base_url or os.environ.get("AGENTKERNEL_BASE_URL") or DEFAULT_BASE_URL).rstrip("/"),
+        base_url=(base_url or (UDS_BASE_URL if uds else DEFAULT_BASE_URL)).rstrip("/"),
         api_key=api_key or os.environ.get("AGENTKERNEL_API_KEY"),
         timeout=timeout if timeout is not None else DEFAULT_TIMEOUT,
+        uds=uds,
     )
+
+
+@lru_cache(maxsize=256)
+def build_url(base_url: str, path: str) -> httpx.URL:
+    """Join ``base_url`` and ``path`` into a parsed URL, cached per endpoint."""
+    return httpx.URL(base_url + path)
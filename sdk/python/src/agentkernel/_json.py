@@ -0,0 +1,26 @@
+"""JSON helpers for the agentkernel SDK, backed by orjson when installed."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+
+    def dumps(obj: Any, /) -> bytes:
+        """Serialize ``obj`` to compact UTF-8 JSON."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def loads(data: bytes | bytearray | memoryview | str, /) -> Any:
+        """Parse JSON from bytes or text. Raises ``ValueError`` on bad input."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+else:
+    # Use the C functions directly: a Python wrapper would add a frame to every
+    # request body and SSE event. orjson raises JSONDecodeError (a ValueError).
+    dumps = orjson.dumps
+    loads = orjson.loads
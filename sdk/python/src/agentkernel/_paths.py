@@ -0,0 +1,23 @@
+"""URL path builders for the per-sandbox API endpoints.
+
+Segments are inserted verbatim: the server splits paths on ``/`` without
+percent-decoding them, and httpx escapes anything that is not URL-safe.
+"""
+
+from __future__ import annotations
+
+
+def sandbox_path(name: str) -> str:
+    return f"/sandboxes/{name}"
+
+
+def exec_path(name: str) -> str:
+    return f"/sandboxes/{name}/exec"
+
+
+def logs_path(name: str) -> str:
+    return f"/sandboxes/{name}/logs"
+
+
+def file_path(name: str, path: str) -> str:
+    return f"/sandboxes/{name}/files/{path}"
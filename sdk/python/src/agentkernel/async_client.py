@@ -2,31 +2,55 @@
 
 from __future__ import annotations
 
+import asyncio
+import copy
+import warnings
 from collections.abc import AsyncIterator
 from types import TracebackType
 from typing import Any
 
 import httpx
 
-from ._config import resolve_config
-from .errors import AgentKernelError, NetworkError, error_from_status
+from ._base import (
+    BaseClient,
+    BatchRunEnvelope,
+    FileReadEnvelope,
+    LogsEnvelope,
+    RunOutputEnvelope,
+    SandboxInfoEnvelope,
+    SandboxListEnvelope,
+    StrEnvelope,
+    http_options,
+    validate_run_output,
+)
+from ._config import DEFAULT_LIMITS, HTTP2_AVAILABLE, resolve_config
+from ._paths import exec_path, file_path, logs_path, sandbox_path
+from .errors import (
+    NetworkError,
+    ServerError,
+    StreamError,
+    ValidationError,
+    error_from_status,
+)
 from .types import (
     BatchRunResponse,
     CreateSandboxOptions,
+    Envelope,
     FileReadResponse,
     RunOptions,
     RunOutput,
     SandboxInfo,
     SecurityProfile,
     StreamEvent,
+    T,
 )
 
-SDK_VERSION = "0.4.0"
-
 
 class AsyncSandboxSession:
     """An async sandbox session with auto-cleanup on context manager exit."""
 
+    __slots__ = ("name", "_client", "_removed", "__weakref__")
+
     def __init__(self, name: str, client: AsyncAgentKernel) -> None:
         self.name = name
         self._client = client
@@ -59,7 +83,7 @@ class AsyncSandboxSession:
         await self.remove()
 
 
-class AsyncAgentKernel:
+class AsyncAgentKernel(BaseClient[httpx.AsyncClient]):
     """Asynchronous client for the agentkernel HTTP API.
 
     Example::
@@ -67,26 +91,58 @@ class AsyncAgentKernel:
         async with AsyncAgentKernel() as client:
             result = await client.run(["echo", "hello"])
             print(result.output)
+
+    Pass ``batch_window_ms`` to coalesce concurrent fast-path ``run()`` calls:
+    calls made within the window are sent as a single ``/batch/run`` request
+    and each caller gets its own result back.
     """
 
+    __slots__ = ("_batch_window", "_batch_pending", "_batch_task", "_batch_flushes")
+
     def __init__(
         self,
         base_url: str | None = None,
         api_key: str | None = None,
         timeout: float | None = None,
+        uds: str | None = None,
+        batch_window_ms: float | None = None,
     ) -> None:
-        config = resolve_config(base_url, api_key, timeout)
-        headers: dict[str, str] = {"User-Agent": f"agentkernel-python-sdk/{SDK_VERSION}"}
-        if config.api_key:
-            headers["Authorization"] = f"Bearer {config.api_key}"
-        self._http = httpx.AsyncClient(
-            base_url=config.base_url,
-            headers=headers,
-            timeout=config.timeout,
-        )
+        config = resolve_config(base_url, api_key, timeout, uds)
+        transport = None
+        if config.uds:
+            transport = httpx.AsyncHTTPTransport(
+                uds=config.uds, limits=DEFAULT_LIMITS, http2=HTTP2_AVAILABLE
+            )
+        super().__init__(config, httpx.AsyncClient(transport=transport, **http_options(config)))
+        self._batch_window = batch_window_ms / 1000 if batch_window_ms is not None else None
+        self._batch_pending: list[tuple[list[str], asyncio.Future[RunOutput]]] = []
+        # The flush still in its window (accepting runs), and every flush not yet done.
+        self._batch_task: asyncio.Task[None] | None = None
+        self._batch_flushes: set[asyncio.Task[None]] = set()
+
+    @staticmethod
+    def enable_uvloop() -> bool:
+        """Use uvloop for new asyncio event loops, if it is installed.
+
+        Prefer ``uvloop.run(main())`` or
+        ``asyncio.Runner(loop_factory=uvloop.new_event_loop)``: this sets the
+        process-wide event loop policy, which Python 3.14 deprecates, and is
+        kept as a fallback for older Pythons. Call it before ``asyncio.run()``.
+        Returns ``False`` (and changes nothing) when uvloop is not available.
+        """
+        try:
+            import uvloop  # type: ignore[import-not-found, unused-ignore]
+        except ImportError:
+            return False
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        return True
 
     async def close(self) -> None:
-        """Close the HTTP client."""
+        """Close the HTTP client, flushing any coalesced runs first."""
+        if self._batch_flushes:
+            await asyncio.gather(*self._batch_flushes)
         await self._http.aclose()
 
     async def __aenter__(self) -> AsyncAgentKernel:
@@ -104,7 +160,19 @@ class AsyncAgentKernel:
 
     async def health(self) -> str:
         """Health check. Returns 'ok'."""
-        return await self._request("GET", "/health")
+        return await self._request("GET", "/health", envelope=StrEnvelope)
+
+    async def warmup(self, connections: int = 4) -> None:
+        """Open ``connections`` pooled connections ahead of a burst of calls.
+
+        Optional: use it on latency-critical paths so concurrent requests don't
+        wait on connection setup. Each connection is primed with a ``/health``.
+        With HTTP/2 the concurrent requests are multiplexed over one connection,
+        so only that one is opened. Does nothing if ``connections <= 0``.
+        """
+        if connections <= 0:
+            return
+        await asyncio.gather(*(self.health() for _ in range(connections)))
 
     async def run(
         self,
@@ -115,12 +183,14 @@ class AsyncAgentKernel:
         fast: bool = True,
     ) -> RunOutput:
         """Run a command in a temporary sandbox."""
-        data = await self._request(
+        if self._batch_window is not None and fast and image is None and profile is None:
+            return await self._run_coalesced(command)
+        return await self._request(
             "POST",
             "/run",
-            json={"command": command, "image": image, "profile": profile, "fast": fast},
+            {"command": command, "image": image, "profile": profile, "fast": fast},
+            envelope=RunOutputEnvelope,
         )
-        return RunOutput(**data)
 
     async def run_stream(
         self,
@@ -129,27 +199,36 @@ class AsyncAgentKernel:
         image: str | None = None,
         profile: SecurityProfile | None = None,
         fast: bool = True,
+        event_filter: frozenset[str] | set[str] | None = None,
     ) -> AsyncIterator[StreamEvent]:
-        """Run a command with SSE streaming output."""
-        from .sse import iter_sse_async
+        """Run a command with SSE streaming output.
+
+        ``event_filter`` limits the events yielded to the given types; ``done``
+        and ``error`` are always delivered.
+        """
+        from .sse import check_event_stream, iter_sse_async
 
         response = await self._http.send(
-            self._http.build_request(
+            self._build_request(
                 "POST",
                 "/run/stream",
-                json={"command": command, "image": image, "profile": profile, "fast": fast},
+                {"command": command, "image": image, "profile": profile, "fast": fast},
             ),
             stream=True,
         )
         if response.status_code >= 400:
             await response.aread()
-            raise error_from_status(response.status_code, response.text)
-        return iter_sse_async(response)
+            raise error_from_status(response.status_code, response.content)
+        try:
+            check_event_stream(response)
+        except StreamError:
+            await response.aclose()
+            raise
+        return iter_sse_async(response, event_filter=event_filter)
 
     async def list_sandboxes(self) -> list[SandboxInfo]:
         """List all sandboxes."""
-        data = await self._request("GET", "/sandboxes")
-        return [SandboxInfo(**s) for s in data]
+        return await self._request("GET", "/sandboxes", envelope=SandboxListEnvelope)
 
     async def create_sandbox(
         self,
@@ -161,31 +240,36 @@ class AsyncAgentKernel:
         profile: SecurityProfile | None = None,
     ) -> SandboxInfo:
         """Create a new sandbox."""
-        data = await self._request(
+        return await self._request(
             "POST",
             "/sandboxes",
-            json={"name": name, "image": image, "vcpus": vcpus, "memory_mb": memory_mb, "profile": profile},
+            {
+                "name": name,
+                "image": image,
+                "vcpus": vcpus,
+                "memory_mb": memory_mb,
+                "profile": profile,
+            },
+            envelope=SandboxInfoEnvelope,
         )
-        return SandboxInfo(**data)
 
     async def get_sandbox(self, name: str) -> SandboxInfo:
         """Get info about a sandbox."""
-        data = await self._request("GET", f"/sandboxes/{name}")
-        return SandboxInfo(**data)
+        return await self._request("GET", sandbox_path(name), envelope=SandboxInfoEnvelope)
 
     async def remove_sandbox(self, name: str) -> None:
         """Remove a sandbox."""
-        await self._request("DELETE", f"/sandboxes/{name}")
+        await self._request_void("DELETE", sandbox_path(name))
 
     async def exec_in_sandbox(self, name: str, command: list[str]) -> RunOutput:
         """Run a command in an existing sandbox."""
-        data = await self._request("POST", f"/sandboxes/{name}/exec", json={"command": command})
-        return RunOutput(**data)
+        return await self._request(
+            "POST", exec_path(name), {"command": command}, envelope=RunOutputEnvelope
+        )
 
     async def read_file(self, name: str, path: str) -> FileReadResponse:
         """Read a file from a sandbox."""
-        data = await self._request("GET", f"/sandboxes/{name}/files/{path}")
-        return FileReadResponse(**data)
+        return await self._request("GET", file_path(name, path), envelope=FileReadEnvelope)
 
     async def write_file(
         self,
@@ -198,23 +282,45 @@ class AsyncAgentKernel:
         """Write a file to a sandbox."""
         return await self._request(
             "PUT",
-            f"/sandboxes/{name}/files/{path}",
-            json={"content": content, "encoding": encoding},
+            file_path(name, path),
+            {"content": content, "encoding": encoding},
+            envelope=StrEnvelope,
         )
 
     async def delete_file(self, name: str, path: str) -> str:
         """Delete a file from a sandbox."""
-        return await self._request("DELETE", f"/sandboxes/{name}/files/{path}")
+        return await self._request("DELETE", file_path(name, path), envelope=StrEnvelope)
 
-    async def get_sandbox_logs(self, name: str) -> list[dict]:
+    async def get_sandbox_logs(self, name: str) -> list[dict[str, Any]]:
         """Get audit log entries for a sandbox."""
-        return await self._request("GET", f"/sandboxes/{name}/logs")
+        return await self._request("GET", logs_path(name), envelope=LogsEnvelope)
 
     async def batch_run(self, commands: list[list[str]]) -> BatchRunResponse:
         """Run multiple commands in parallel."""
         batch_commands = [{"command": cmd} for cmd in commands]
-        data = await self._request("POST", "/batch/run", json={"commands": batch_commands})
-        return BatchRunResponse(**data)
+        return await self._request(
+            "POST", "/batch/run", {"commands": batch_commands}, envelope=BatchRunEnvelope
+        )
+
+    async def parallel_batch_run(
+        self, commands: list[list[str]], *, concurrency: int = 16
+    ) -> list[RunOutput]:
+        """Run multiple commands as concurrent ``/run`` requests.
+
+        Unlike ``batch_run``, fan-out happens client-side with at most
+        ``concurrency`` requests in flight. Results are in command order.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be greater than 0")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(command: list[str]) -> RunOutput:
+            async with semaphore:
+                return await self._request(
+                    "POST", "/run", {"command": command, "fast": True}, envelope=RunOutputEnvelope
+                )
+
+        return await asyncio.gather(*(run_one(command) for command in commands))
 
     async def sandbox(
         self,
@@ -233,23 +339,75 @@ class AsyncAgentKernel:
                 await sb.run(["echo", "hello"])
             # sandbox auto-removed
         """
-        await self.create_sandbox(name, image=image, vcpus=vcpus, memory_mb=memory_mb, profile=profile)
+        await self.create_sandbox(
+            name, image=image, vcpus=vcpus, memory_mb=memory_mb, profile=profile
+        )
         return AsyncSandboxSession(name, self)
 
     # -- Internal --
 
-    async def _request(self, method: str, path: str, **kwargs: Any) -> Any:
+    async def _run_coalesced(self, command: list[str]) -> RunOutput:
+        # Match the 400 a direct /run gives, rather than a per-command batch error.
+        if not command:
+            raise ValidationError("command is required")
+        future: asyncio.Future[RunOutput] = asyncio.get_running_loop().create_future()
+        self._batch_pending.append((command, future))
+        if self._batch_task is None:
+            task = asyncio.create_task(self._flush_batch())
+            self._batch_task = task
+            self._batch_flushes.add(task)
+            task.add_done_callback(self._batch_flushes.discard)
+        return await future
+
+    async def _flush_batch(self) -> None:
+        assert self._batch_window is not None
+        await asyncio.sleep(self._batch_window)
+        pending, self._batch_pending = self._batch_pending, []
+        self._batch_task = None
         try:
-            response = await self._http.request(method, path, **kwargs)
+            batch = await self.batch_run([command for command, _ in pending])
+        except Exception as e:
+            # One exception object per caller: each await re-raises and appends
+            # to its traceback, so sharing one instance would tangle them.
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(copy.copy(e))
+            return
+        results = batch.results
+        for i, (_, future) in enumerate(pending):
+            if future.done():
+                continue
+            if i >= len(results):
+                # A short result list must not leave callers waiting forever.
+                message = f"Batch returned {len(results)} results for {len(pending)} commands"
+                future.set_exception(ServerError(message))
+            elif results[i].error is not None:
+                future.set_exception(ServerError(results[i].error))
+            else:
+                future.set_result(validate_run_output({"output": results[i].output or ""}))
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        payload: dict[str, Any] | None = None,
+        *,
+        envelope: type[Envelope[T]],
+    ) -> T:
+        response = await self._send(self._build_request(method, path, payload))
+        return self._parse_response(response, envelope)
+
+    async def _request_void(
+        self, method: str, path: str, payload: dict[str, Any] | None = None
+    ) -> None:
+        """Like ``_request`` for callers that discard the result: the body is not parsed."""
+        response = await self._send(self._build_request(method, path, payload))
+        self._check_status(response)
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        try:
+            return await self._http.send(request)
         except httpx.ConnectError as e:
             raise NetworkError(f"Failed to connect: {e}") from e
         except httpx.TimeoutException as e:
             raise NetworkError(f"Request timed out: {e}") from e
-
-        if response.status_code >= 400:
-            raise error_from_status(response.status_code, response.text)
-
-        data = response.json()
-        if not data.get("success"):
-            raise AgentKernelError(data.get("error", "Unknown error"))
-        return data.get("data")
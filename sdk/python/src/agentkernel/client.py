@@ -3,29 +3,44 @@
 from __future__ import annotations
 
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import httpx
 
-from ._config import resolve_config
-from .errors import AgentKernelError, NetworkError, error_from_status
+from ._base import (
+    BaseClient,
+    BatchRunEnvelope,
+    FileReadEnvelope,
+    LogsEnvelope,
+    RunOutputEnvelope,
+    SandboxInfoEnvelope,
+    SandboxListEnvelope,
+    StrEnvelope,
+    http_options,
+)
+from ._config import DEFAULT_LIMITS, HTTP2_AVAILABLE, resolve_config
+from ._paths import exec_path, file_path, logs_path, sandbox_path
+from .errors import NetworkError, error_from_status
 from .types import (
     BatchRunResponse,
     CreateSandboxOptions,
+    Envelope,
     FileReadResponse,
     RunOptions,
     RunOutput,
     SandboxInfo,
     SecurityProfile,
     StreamEvent,
+    T,
 )
 
-SDK_VERSION = "0.4.0"
-
 
 class SandboxSession:
     """A sandbox session with auto-cleanup on context manager exit."""
 
+    __slots__ = ("name", "_client", "_removed", "__weakref__")
+
     def __init__(self, name: str, client: AgentKernel) -> None:
         self.name = name
         self._client = client
@@ -53,7 +68,7 @@ class SandboxSession:
         self.remove()
 
 
-class AgentKernel:
+class AgentKernel(BaseClient[httpx.Client]):
     """Synchronous client for the agentkernel HTTP API.
 
     Example::
@@ -63,21 +78,22 @@ class AgentKernel:
             print(result.output)
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         base_url: str | None = None,
         api_key: str | None = None,
         timeout: float | None = None,
+        uds: str | None = None,
     ) -> None:
-        config = resolve_config(base_url, api_key, timeout)
-        headers: dict[str, str] = {"User-Agent": f"agentkernel-python-sdk/{SDK_VERSION}"}
-        if config.api_key:
-            headers["Authorization"] = f"Bearer {config.api_key}"
-        self._http = httpx.Client(
-            base_url=config.base_url,
-            headers=headers,
-            timeout=config.timeout,
-        )
+        config = resolve_config(base_url, api_key, timeout, uds)
+        transport = None
+        if config.uds:
+            transport = httpx.HTTPTransport(
+                uds=config.uds, limits=DEFAULT_LIMITS, http2=HTTP2_AVAILABLE
+            )
+        super().__init__(config, httpx.Client(transport=transport, **http_options(config)))
 
     def close(self) -> None:
         """Close the HTTP client."""
@@ -93,7 +109,20 @@ class AgentKernel:
 
     def health(self) -> str:
         """Health check. Returns 'ok'."""
-        return self._request("GET", "/health")
+        return self._request("GET", "/health", envelope=StrEnvelope)
+
+    def warmup(self, connections: int = 4) -> None:
+        """Open ``connections`` pooled connections ahead of a burst of calls.
+
+        Optional: use it on latency-critical paths so concurrent requests don't
+        wait on connection setup. Each connection is primed with a ``/health``.
+        With HTTP/2 the concurrent requests are multiplexed over one connection,
+        so only that one is opened. Does nothing if ``connections <= 0``.
+        """
+        if connections <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=connections) as pool:
+            list(pool.map(lambda _: self.health(), range(connections)))
 
     def run(
         self,
@@ -104,12 +133,12 @@ class AgentKernel:
         fast: bool = True,
     ) -> RunOutput:
         """Run a command in a temporary sandbox."""
-        data = self._request(
+        return self._request(
             "POST",
             "/run",
-            json={"command": command, "image": image, "profile": profile, "fast": fast},
+            {"command": command, "image": image, "profile": profile, "fast": fast},
+            envelope=RunOutputEnvelope,
         )
-        return RunOutput(**data)
 
     def run_stream(
         self,
@@ -118,24 +147,35 @@ class AgentKernel:
         image: str | None = None,
         profile: SecurityProfile | None = None,
         fast: bool = True,
+        event_filter: frozenset[str] | set[str] | None = None,
     ) -> Iterator[StreamEvent]:
-        """Run a command with SSE streaming output."""
-        from .sse import iter_sse_sync
+        """Run a command with SSE streaming output.
 
-        with self._http.stream(
-            "POST",
-            "/run/stream",
-            json={"command": command, "image": image, "profile": profile, "fast": fast},
-        ) as response:
+        ``event_filter`` limits the events yielded to the given types; ``done``
+        and ``error`` are always delivered.
+        """
+        from .sse import check_event_stream, iter_sse_sync
+
+        response = self._http.send(
+            self._build_request(
+                "POST",
+                "/run/stream",
+                {"command": command, "image": image, "profile": profile, "fast": fast},
+            ),
+            stream=True,
+        )
+        try:
             if response.status_code >= 400:
                 response.read()
-                raise error_from_status(response.status_code, response.text)
-            yield from iter_sse_sync(response)
+                raise error_from_status(response.status_code, response.content)
+            check_event_stream(response)
+            yield from iter_sse_sync(response, event_filter=event_filter)
+        finally:
+            response.close()
 
     def list_sandboxes(self) -> list[SandboxInfo]:
         """List all sandboxes."""
-        data = self._request("GET", "/sandboxes")
-        return [SandboxInfo(**s) for s in data]
+        return self._request("GET", "/sandboxes", envelope=SandboxListEnvelope)
 
     def create_sandbox(
         self,
@@ -147,31 +187,36 @@ class AgentKernel:
         profile: SecurityProfile | None = None,
     ) -> SandboxInfo:
         """Create a new sandbox."""
-        data = self._request(
+        return self._request(
             "POST",
             "/sandboxes",
-            json={"name": name, "image": image, "vcpus": vcpus, "memory_mb": memory_mb, "profile": profile},
+            {
+                "name": name,
+                "image": image,
+                "vcpus": vcpus,
+                "memory_mb": memory_mb,
+                "profile": profile,
+            },
+            envelope=SandboxInfoEnvelope,
         )
-        return SandboxInfo(**data)
 
     def get_sandbox(self, name: str) -> SandboxInfo:
         """Get info about a sandbox."""
-        data = self._request("GET", f"/sandboxes/{name}")
-        return SandboxInfo(**data)
+        return self._request("GET", sandbox_path(name), envelope=SandboxInfoEnvelope)
 
     def remove_sandbox(self, name: str) -> None:
         """Remove a sandbox."""
-        self._request("DELETE", f"/sandboxes/{name}")
+        self._request_void("DELETE", sandbox_path(name))
 
     def exec_in_sandbox(self, name: str, command: list[str]) -> RunOutput:
         """Run a command in an existing sandbox."""
-        data = self._request("POST", f"/sandboxes/{name}/exec", json={"command": command})
-        return RunOutput(**data)
+        return self._request(
+            "POST", exec_path(name), {"command": command}, envelope=RunOutputEnvelope
+        )
 
     def read_file(self, name: str, path: str) -> FileReadResponse:
         """Read a file from a sandbox."""
-        data = self._request("GET", f"/sandboxes/{name}/files/{path}")
-        return FileReadResponse(**data)
+        return self._request("GET", file_path(name, path), envelope=FileReadEnvelope)
 
     def write_file(
         self,
@@ -184,23 +229,44 @@ class AgentKernel:
         """Write a file to a sandbox."""
         return self._request(
             "PUT",
-            f"/sandboxes/{name}/files/{path}",
-            json={"content": content, "encoding": encoding},
+            file_path(name, path),
+            {"content": content, "encoding": encoding},
+            envelope=StrEnvelope,
         )
 
     def delete_file(self, name: str, path: str) -> str:
         """Delete a file from a sandbox."""
-        return self._request("DELETE", f"/sandboxes/{name}/files/{path}")
+        return self._request("DELETE", file_path(name, path), envelope=StrEnvelope)
 
-    def get_sandbox_logs(self, name: str) -> list[dict]:
+    def get_sandbox_logs(self, name: str) -> list[dict[str, Any]]:
         """Get audit log entries for a sandbox."""
-        return self._request("GET", f"/sandboxes/{name}/logs")
+        return self._request("GET", logs_path(name), envelope=LogsEnvelope)
 
     def batch_run(self, commands: list[list[str]]) -> BatchRunResponse:
         """Run multiple commands in parallel."""
         batch_commands = [{"command": cmd} for cmd in commands]
-        data = self._request("POST", "/batch/run", json={"commands": batch_commands})
-        return BatchRunResponse(**data)
+        return self._request(
+            "POST", "/batch/run", {"commands": batch_commands}, envelope=BatchRunEnvelope
+        )
+
+    def parallel_batch_run(
+        self, commands: list[list[str]], *, concurrency: int = 16
+    ) -> list[RunOutput]:
+        """Run multiple commands as concurrent ``/run`` requests.
+
+        Unlike ``batch_run``, fan-out happens client-side on up to
+        ``concurrency`` threads. Results are in command order.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be greater than 0")
+
+        def run_one(command: list[str]) -> RunOutput:
+            return self._request(
+                "POST", "/run", {"command": command, "fast": True}, envelope=RunOutputEnvelope
+            )
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(run_one, commands))
 
     def sandbox(
         self,
@@ -224,18 +290,26 @@ class AgentKernel:
 
     # -- Internal --
 
-    def _request(self, method: str, path: str, **kwargs: Any) -> Any:
+    def _request(
+        self,
+        method: str,
+        path: str,
+        payload: dict[str, Any] | None = None,
+        *,
+        envelope: type[Envelope[T]],
+    ) -> T:
+        response = self._send(self._build_request(method, path, payload))
+        return self._parse_response(response, envelope)
+
+    def _request_void(self, method: str, path: str, payload: dict[str, Any] | None = None) -> None:
+        """Like ``_request`` for callers that discard the result: the body is not parsed."""
+        response = self._send(self._build_request(method, path, payload))
+        self._check_status(response)
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
         try:
-            response = self._http.request(method, path, **kwargs)
+            return self._http.send(request)
         except httpx.ConnectError as e:
             raise NetworkError(f"Failed to connect: {e}") from e
         except httpx.TimeoutException as e:
             raise NetworkError(f"Request timed out: {e}") from e
-
-        if response.status_code >= 400:
-            raise error_from_status(response.status_code, response.text)
-
-        data = response.json()
-        if not data.get("success"):
-            raise AgentKernelError(data.get("error", "Unknown error"))
-        return data.get("data")
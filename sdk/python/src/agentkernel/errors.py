@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from ._json import loads
+
 
 class AgentKernelError(Exception):
     """Base error for all agentkernel SDK errors."""
@@ -39,16 +41,23 @@ class StreamError(AgentKernelError):
     """SSE streaming error."""
 
 
-def error_from_status(status: int, body: str) -> AgentKernelError:
-    """Map an HTTP status code + body to the appropriate error."""
-    import json
+_STATUS_TO_ERROR: dict[int, type[AgentKernelError]] = {
+    400: ValidationError,
+    401: AuthError,
+    404: NotFoundError,
+}
+
+
+def error_from_status(status: int, body: bytes | str) -> AgentKernelError:
+    """Map an HTTP status code + body to the appropriate error.
 
+    ``body`` is normally the raw response bytes, which are parsed without
+    first decoding them to text.
+    """
     try:
-        parsed = json.loads(body)
-        message = parsed.get("error", body)
-    except (json.JSONDecodeError, TypeError):
-        message = body
+        message = loads(body)["error"]
+    except (ValueError, TypeError, KeyError):
+        message = body.decode(errors="replace") if isinstance(body, bytes) else body
 
-    errors = {400: ValidationError, 401: AuthError, 404: NotFoundError}
-    cls = errors.get(status, ServerError)
+    cls = _STATUS_TO_ERROR.get(status, ServerError)
     return cls(message)
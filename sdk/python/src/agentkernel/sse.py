@@ -2,48 +2,287 @@
 
 from __future__ import annotations
 
-import json
-from collections.abc import AsyncIterator, Iterator
-from typing import TYPE_CHECKING
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator
 
 import httpx
-import httpx_sse
 
+from .errors import StreamError
 from .types import StreamEvent
 
-if TYPE_CHECKING:
-    pass
-
-KNOWN_EVENTS = frozenset({"started", "progress", "output", "done", "error"})
-
-
-def iter_sse_sync(response: httpx.Response) -> Iterator[StreamEvent]:
-    """Parse SSE events from a sync httpx response."""
-    with httpx_sse.connect_sse(response.stream) as event_source:  # type: ignore[arg-type]
-        for sse in event_source.iter_sse():
-            if sse.event not in KNOWN_EVENTS:
-                continue
-            try:
-                data = json.loads(sse.data)
-            except (json.JSONDecodeError, TypeError):
-                data = {"raw": sse.data}
-            event = StreamEvent(type=sse.event, data=data)  # type: ignore[arg-type]
-            yield event
-            if event.type in ("done", "error"):
-                return
+# Event name -> whether it ends the stream; names not listed here are skipped.
+_EVENT_TERMINAL = {
+    "started": False,
+    "progress": False,
+    "output": False,
+    "done": True,
+    "error": True,
+}
+KNOWN_EVENTS = frozenset(_EVENT_TERMINAL)
+TERMINAL_EVENTS = frozenset(name for name, terminal in _EVENT_TERMINAL.items() if terminal)
+
+# Raw ``data:`` bytes of a frame: a view into the stream buffer or a copy.
+Payload = bytearray | memoryview
+
+
+class _FrameBuffer:
+    """Accumulates raw SSE bytes and splits off complete ``event``/``data`` frames.
+
+    The server writes LF-delimited frames (``event: x\\ndata: {...}\\n\\n``), so
+    frames are located with ``bytearray.find`` on the raw bytes; only the event
+    name is ever decoded to ``str``. CRLF and bare-CR line endings, which SSE
+    also allows, are rewritten to LF as chunks arrive. Payloads are returned as
+    views into the buffer, valid until the next :meth:`feed`.
+    """
+
+    __slots__ = ("_buf", "_view", "_len", "_scan", "_start", "_cr")
+
+    def __init__(self, size: int = 65536) -> None:
+        # One buffer per stream, written in place: there is a realloc only when
+        # a single frame outgrows it, not on every chunk.
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        self._len = 0
+        self._scan = 0
+        self._start = 0
+        self._cr = False
+
+    def feed(self, chunk: bytes) -> list[tuple[str, Payload]]:
+        if self._cr:
+            chunk = b"\r" + chunk
+            self._cr = False
+        if b"\r" in chunk:
+            if chunk.endswith(b"\r"):
+                # Its \n may start the next chunk: hold it back so the pair
+                # isn't read as two line ends.
+                chunk = chunk[:-1]
+                self._cr = True
+            chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        if start := self._start:
+            # The previous frames have been decoded by now, so their bytes can
+            # go: move the partial frame, if any, back to the front.
+            self._len -= start
+            self._view[: self._len] = self._view[start : start + self._len]
+            self._scan -= start
+            self._start = 0
+        length = self._len + len(chunk)
+        if length > len(self._buf):
+            self._grow(length)
+        self._view[self._len : length] = chunk
+        self._len = length
+
+        buf, view = self._buf, self._view
+        frames: list[tuple[str, Payload]] = []
+        start = 0
+        while (end := buf.find(b"\n\n", self._scan, length)) != -1:
+            frames.append(_parse_frame(buf, view, start, end))
+            start = self._scan = end + 2
+        self._start = start
+        # A delimiter may straddle the next chunk boundary; rescan its first byte.
+        self._scan = max(length - 1, start)
+        return frames
+
+    def flush(self) -> list[tuple[str, Payload]]:
+        """Complete any frame ended by a held-back CR; call at end of stream."""
+        return self.feed(b"\n") if self._cr else []
+
+    def _grow(self, needed: int) -> None:
+        # Swap in a new buffer rather than resizing this one: payload views
+        # from an earlier feed() may still be alive (always on PyPy), and a
+        # bytearray with live exports can't be resized.
+        buf = bytearray(max(needed, 2 * len(self._buf)))
+        buf[: self._len] = self._view[: self._len]
+        self._buf = buf
+        self._view = memoryview(buf)
+
+
+def _parse_frame(buf: bytearray, view: memoryview, start: int, end: int) -> tuple[str, Payload]:
+    # Fast path for the server's own frame shape: `event: x\ndata: y`. The
+    # payload is a zero-copy view; the JSON parser reads it in place.
+    if buf.startswith(b"event: ", start, end):
+        eol = buf.find(b"\n", start, end)
+        if (
+            eol != -1
+            and buf.startswith(b"data: ", eol + 1, end)
+            and buf.find(b"\n", eol + 1, end) == -1
+        ):
+            return buf[start + 7 : eol].decode(), view[eol + 7 : end]
+
+    event = "message"
+    data: list[bytearray] = []
+    pos = start
+    while pos < end:
+        eol = buf.find(b"\n", pos, end)
+        if eol == -1:
+            eol = end
+        if buf.startswith(b"data:", pos, eol):
+            value = pos + 5
+            if buf.startswith(b" ", value, eol):
+                value += 1
+            data.append(buf[value:eol])
+        elif buf.startswith(b"event:", pos, eol):
+            event = buf[pos + 6 : eol].strip().decode()
+        pos = eol + 1
+    return event, data[0] if len(data) == 1 else bytearray(b"\n").join(data)
+
+
+def _wanted_events(event_filter: frozenset[str] | set[str] | None) -> frozenset[str] | None:
+    """Resolve ``event_filter`` once per stream, terminal events included."""
+    if isinstance(event_filter, str):
+        # A bare string would be read as a set of single characters.
+        raise TypeError(f"event_filter must be a set of event types, not {event_filter!r}")
+    return None if event_filter is None else TERMINAL_EVENTS.union(event_filter)
+
+
+def _decode_frames(
+    frames: list[tuple[str, Payload]], wanted: frozenset[str] | None = None
+) -> tuple[list[StreamEvent], bool]:
+    """Decode the known events in ``frames``, stopping after the first terminal one.
 
+    Events not in ``wanted`` (see :func:`_wanted_events`) are dropped before
+    their payload is parsed.
 
-async def iter_sse_async(response: httpx.Response) -> AsyncIterator[StreamEvent]:
-    """Parse SSE events from an async httpx response."""
-    async with httpx_sse.aconnect_sse(response.stream) as event_source:  # type: ignore[arg-type]
-        async for sse in event_source.aiter_sse():
-            if sse.event not in KNOWN_EVENTS:
-                continue
-            try:
-                data = json.loads(sse.data)
-            except (json.JSONDecodeError, TypeError):
-                data = {"raw": sse.data}
-            event = StreamEvent(type=sse.event, data=data)  # type: ignore[arg-type]
-            yield event
-            if event.type in ("done", "error"):
+    Both iterators share this plain function, so the per-event work runs outside
+    the generator frames and is written once for the sync and async paths.
+    Returns the events and whether the stream has finished.
+    """
+    events: list[StreamEvent] = []
+    # Runs once per network event: keep the globals and bound method in locals.
+    terminal_for, decode, append = _EVENT_TERMINAL.get, StreamEvent.from_raw, events.append
+    for name, data in frames:
+        # One dict lookup answers both "known?" and "terminal?".
+        terminal = terminal_for(name)
+        if terminal is None or (wanted is not None and name not in wanted):
+            continue
+        append(decode(name, data))  # type: ignore[arg-type]
+        if terminal:
+            return events, True
+    return events, False
+
+
+def check_event_stream(response: httpx.Response) -> None:
+    """Raise :class:`StreamError` unless ``response`` is an SSE stream."""
+    content_type = response.headers.get("content-type", "")
+    if "text/event-stream" not in content_type:
+        raise StreamError(f"Expected Content-Type text/event-stream, got {content_type!r}")
+
+
+def iter_sse_sync_batched(
+    response: httpx.Response,
+    max_batch: int = 64,
+    event_filter: frozenset[str] | set[str] | None = None,
+) -> Iterator[list[StreamEvent]]:
+    """Parse SSE events from a sync httpx response, a list at a time.
+
+    Each list holds the events that arrived in one network chunk, capped at
+    ``max_batch``, so throughput-bound consumers resume once per batch rather
+    than once per event. The last list ends with the terminal event.
+
+    If ``event_filter`` is given, only those event types are decoded and
+    yielded; ``done`` and ``error`` are always delivered.
+    """
+    frames = _FrameBuffer()
+    wanted = _wanted_events(event_filter)
+    for chunk in response.iter_bytes():
+        events, finished = _decode_frames(frames.feed(chunk), wanted)
+        for i in range(0, len(events), max_batch):
+            yield events[i : i + max_batch]
+        if finished:
+            return
+    if tail := frames.flush():
+        events, _ = _decode_frames(tail, wanted)
+        for i in range(0, len(events), max_batch):
+            yield events[i : i + max_batch]
+
+
+async def iter_sse_async_batched(
+    response: httpx.Response,
+    max_batch: int = 64,
+    event_filter: frozenset[str] | set[str] | None = None,
+) -> AsyncGenerator[list[StreamEvent], None]:
+    """Parse SSE events from an async httpx response, a list at a time.
+
+    See :func:`iter_sse_sync_batched`. The response is closed when the
+    iterator finishes or is closed.
+    """
+    frames = _FrameBuffer()
+    wanted = _wanted_events(event_filter)
+    try:
+        async for chunk in response.aiter_bytes():
+            events, finished = _decode_frames(frames.feed(chunk), wanted)
+            for i in range(0, len(events), max_batch):
+                yield events[i : i + max_batch]
+            if finished:
                 return
+        if tail := frames.flush():
+            events, _ = _decode_frames(tail, wanted)
+            for i in range(0, len(events), max_batch):
+                yield events[i : i + max_batch]
+    finally:
+        await response.aclose()
+
+
+def iter_sse_sync(
+    response: httpx.Response, event_filter: frozenset[str] | set[str] | None = None
+) -> Iterator[StreamEvent]:
+    """Parse SSE events from a sync httpx response.
+
+    See :func:`iter_sse_sync_batched` for ``event_filter``.
+    """
+    for batch in iter_sse_sync_batched(response, event_filter=event_filter):
+        yield from batch
+
+
+async def iter_sse_async(
+    response: httpx.Response,
+    prefetch: int = 4,
+    event_filter: frozenset[str] | set[str] | None = None,
+) -> AsyncIterator[StreamEvent]:
+    """Parse SSE events from an async httpx response.
+
+    A background task reads and decodes up to ``prefetch`` chunks ahead while
+    the caller handles the current event, so the socket isn't idle during slow
+    processing. Pass ``prefetch=0`` to read only on demand. See
+    :func:`iter_sse_sync_batched` for ``event_filter``.
+    """
+    if prefetch <= 0:
+        batches = iter_sse_async_batched(response, event_filter=event_filter)
+        try:
+            async for batch in batches:
+                for event in batch:
+                    yield event
+        finally:
+            await batches.aclose()
+        return
+
+    queue: asyncio.Queue[list[StreamEvent] | Exception | None] = asyncio.Queue(prefetch)
+    producer = asyncio.create_task(_prefetch(response, queue, event_filter))
+    try:
+        while (item := await queue.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            for event in item:
+                yield event
+    finally:
+        producer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await producer
+
+
+async def _prefetch(
+    response: httpx.Response,
+    queue: asyncio.Queue[list[StreamEvent] | Exception | None],
+    event_filter: frozenset[str] | set[str] | None,
+) -> None:
+    """Feed decoded batches into ``queue``, then ``None``, or the error that ended it."""
+    batches = iter_sse_async_batched(response, event_filter=event_filter)
+    try:
+        async for batch in batches:
+            await queue.put(batch)
+    except Exception as exc:
+        await queue.put(exc)
+        return
+    finally:
+        await batches.aclose()
+    await queue.put(None)
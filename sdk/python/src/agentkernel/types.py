@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Literal
+import copy
+import dataclasses
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, Generic, Literal, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
+from ._json import loads
+
+T = TypeVar("T")
 
 SecurityProfile = Literal["permissive", "moderate", "restrictive"]
 SandboxStatus = Literal["running", "stopped"]
@@ -47,11 +54,63 @@ class CreateSandboxOptions(BaseModel):
     profile: SecurityProfile | None = None
 
 
-class StreamEvent(BaseModel):
-    """SSE stream event."""
+@dataclass(frozen=True, slots=True)
+class StreamEvent:
+    """SSE stream event.
+
+    A slotted dataclass rather than a model, since one is built per network
+    event from fields the parser has already checked. pydantic still validates
+    and serializes it inside models and ``TypeAdapter``, and the ``model_*``
+    methods it had as a ``BaseModel`` are kept for existing callers.
+    """
 
     type: StreamEventType
-    data: dict
+    data: dict[str, Any]
+
+    @classmethod
+    def from_raw(cls, type: StreamEventType, raw: bytes | bytearray | memoryview) -> StreamEvent:
+        """Build an event from the raw bytes of its ``data:`` field.
+
+        A JSON object becomes ``data``; anything else is kept as
+        ``{"raw": <text>}``.
+        """
+        payload = None
+        # Only a JSON object is kept as-is, so skip the parser (and the cost of
+        # a raised JSONDecodeError) for bare-text payloads like `building`.
+        if raw and raw[0] == 0x7B:  # b"{"
+            try:
+                payload = loads(raw)
+            except ValueError:
+                pass
+        if not isinstance(payload, dict):
+            payload = {"raw": str(raw, "utf-8", "replace")}
+        return cls(type, payload)
+
+    @classmethod
+    def model_validate(cls, obj: Any) -> StreamEvent:
+        """Validate ``obj`` (a mapping or event) into a ``StreamEvent``."""
+        return _stream_event_adapter().validate_python(obj)
+
+    def model_dump(self, **kwargs: Any) -> dict[str, Any]:
+        """Serialize to a dict; accepts ``TypeAdapter.dump_python`` options."""
+        return _stream_event_adapter().dump_python(self, **kwargs)  # type: ignore[no-any-return]
+
+    def model_dump_json(self, **kwargs: Any) -> str:
+        """Serialize to JSON; accepts ``TypeAdapter.dump_json`` options."""
+        return _stream_event_adapter().dump_json(self, **kwargs).decode()
+
+    def model_copy(
+        self, *, update: dict[str, Any] | None = None, deep: bool = False
+    ) -> StreamEvent:
+        """Return a copy with ``update`` applied, like ``BaseModel.model_copy``."""
+        event = dataclasses.replace(self, **(update or {}))
+        return copy.deepcopy(event) if deep else event
+
+
+@cache
+def _stream_event_adapter() -> TypeAdapter[StreamEvent]:
+    # Built on first use, so streaming (which never validates) doesn't pay for it.
+    return TypeAdapter(StreamEvent)
 
 
 class FileReadResponse(BaseModel):
@@ -79,3 +138,11 @@ class BatchRunResponse(BaseModel):
     """Response from batch execution."""
 
     results: list[BatchResult]
+
+
+class Envelope(BaseModel, Generic[T]):
+    """Response envelope wrapping every API payload."""
+
+    success: bool
+    data: T | None = None
+    error: str | None = None
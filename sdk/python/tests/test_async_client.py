@@ -1,9 +1,24 @@
 """Tests for the asynchronous AsyncAgentKernel client."""
 
+import asyncio
+import json
+import sys
+import types
+import warnings
+
+import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 
-from agentkernel import AsyncAgentKernel, NotFoundError, RunOutput, SandboxInfo
+from agentkernel import (
+    AsyncAgentKernel,
+    NotFoundError,
+    RunOutput,
+    SandboxInfo,
+    ServerError,
+    StreamError,
+    ValidationError,
+)
 
 BASE_URL = "http://localhost:9999"
 
@@ -19,6 +34,19 @@ class TestAsyncHealth:
             assert await client.health() == "ok"
 
 
+class TestAsyncWarmup:
+    async def test_primes_connections(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(json={"success": True, "data": "ok"}, is_reusable=True)
+        async with make_client() as client:
+            await client.warmup(3)
+        assert len(httpx_mock.get_requests()) == 3
+
+    async def test_zero_connections_is_a_no_op(self, httpx_mock: HTTPXMock) -> None:
+        async with make_client() as client:
+            await client.warmup(0)
+        assert httpx_mock.get_requests() == []
+
+
 class TestAsyncRun:
     async def test_returns_output(self, httpx_mock: HTTPXMock) -> None:
         httpx_mock.add_response(json={"success": True, "data": {"output": "hello\n"}})
@@ -28,6 +56,23 @@ class TestAsyncRun:
             assert result.output == "hello\n"
 
 
+class TestAsyncRunStream:
+    async def test_yields_events(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            headers={"Content-Type": "text/event-stream"},
+            content=b'event: output\ndata: {"data":"hi"}\n\nevent: done\ndata: {}\n\n',
+        )
+        async with make_client() as client:
+            events = [e async for e in await client.run_stream(["echo", "hi"])]
+        assert [e.type for e in events] == ["output", "done"]
+
+    async def test_rejects_non_event_stream(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(json={"success": True, "data": {"output": "hi"}})
+        async with make_client() as client:
+            with pytest.raises(StreamError, match="text/event-stream"):
+                await client.run_stream(["echo", "hi"])
+
+
 class TestAsyncListSandboxes:
     async def test_returns_list(self, httpx_mock: HTTPXMock) -> None:
         httpx_mock.add_response(
@@ -62,3 +107,123 @@ class TestAsyncSandboxSession:
                 assert sb.name == "sess"
         requests = httpx_mock.get_requests()
         assert requests[-1].method == "DELETE"
+
+
+class TestAsyncRunCoalescing:
+    async def test_coalesces_concurrent_runs(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            url=f"{BASE_URL}/batch/run",
+            json={
+                "success": True,
+                "data": {
+                    "results": [
+                        {"output": "a\n", "error": None},
+                        {"output": None, "error": "boom"},
+                        {"output": "c\n", "error": None},
+                    ]
+                },
+            },
+        )
+        async with make_client(batch_window_ms=5) as client:
+            a, b, c = await asyncio.gather(
+                client.run(["echo", "a"]),
+                client.run(["false"]),
+                client.run(["echo", "c"]),
+                return_exceptions=True,
+            )
+        assert isinstance(a, RunOutput) and a.output == "a\n"
+        assert isinstance(b, ServerError)
+        assert isinstance(c, RunOutput) and c.output == "c\n"
+        requests = httpx_mock.get_requests()
+        assert len(requests) == 1
+        assert json.loads(requests[0].content)["commands"][1] == {"command": ["false"]}
+
+    async def test_rejects_empty_command(self, httpx_mock: HTTPXMock) -> None:
+        async with make_client(batch_window_ms=5) as client:
+            with pytest.raises(ValidationError, match="command is required"):
+                await client.run([])
+        assert httpx_mock.get_requests() == []
+
+    async def test_missing_results_fail_their_callers(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            url=f"{BASE_URL}/batch/run",
+            json={"success": True, "data": {"results": [{"output": "a\n", "error": None}]}},
+        )
+        async with make_client(batch_window_ms=5) as client:
+            a, b = await asyncio.gather(
+                client.run(["echo", "a"]), client.run(["echo", "b"]), return_exceptions=True
+            )
+        assert isinstance(a, RunOutput) and a.output == "a\n"
+        assert isinstance(b, ServerError)
+
+    async def test_request_error_is_raised_per_caller(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=f"{BASE_URL}/batch/run", status_code=500, text="down")
+        async with make_client(batch_window_ms=5) as client:
+            a, b = await asyncio.gather(
+                client.run(["echo", "a"]), client.run(["echo", "b"]), return_exceptions=True
+            )
+        assert isinstance(a, ServerError) and isinstance(b, ServerError)
+        assert a is not b
+
+    async def test_close_waits_for_in_flight_flush(self, httpx_mock: HTTPXMock) -> None:
+        async def slow_batch(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.05)
+            return httpx.Response(
+                200, json={"success": True, "data": {"results": [{"output": "a\n"}]}}
+            )
+
+        httpx_mock.add_callback(slow_batch, url=f"{BASE_URL}/batch/run")
+        client = make_client(batch_window_ms=1)
+        run = asyncio.create_task(client.run(["echo", "a"]))
+        await asyncio.sleep(0.02)  # past the window: the batch request is in flight
+        await client.close()
+        assert (await run).output == "a\n"
+
+    async def test_custom_image_bypasses_batch(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            url=f"{BASE_URL}/run", json={"success": True, "data": {"output": "ok\n"}}
+        )
+        async with make_client(batch_window_ms=5) as client:
+            result = await client.run(["true"], image="python:3.12-alpine")
+        assert result.output == "ok\n"
+
+
+def echo_run(request: httpx.Request) -> httpx.Response:
+    command = json.loads(request.content)["command"]
+    return httpx.Response(200, json={"success": True, "data": {"output": " ".join(command)}})
+
+
+class TestAsyncParallelBatchRun:
+    async def test_preserves_order(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_callback(echo_run, url=f"{BASE_URL}/run", is_reusable=True)
+        commands = [["echo", str(i)] for i in range(5)]
+        async with make_client() as client:
+            result = await client.parallel_batch_run(commands, concurrency=2)
+        assert [r.output for r in result] == [f"echo {i}" for i in range(5)]
+        assert len(httpx_mock.get_requests()) == 5
+
+    async def test_rejects_zero_concurrency(self) -> None:
+        async with make_client() as client:
+            with pytest.raises(ValueError, match="concurrency"):
+                await client.parallel_batch_run([["true"]], concurrency=0)
+
+
+class TestEnableUvloop:
+    def test_returns_false_without_uvloop(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setitem(sys.modules, "uvloop", None)
+        assert AsyncAgentKernel.enable_uvloop() is False
+
+    def test_policy_fallback_hides_deprecation(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        policies: list[object] = []
+
+        def set_policy(policy: object) -> None:
+            warnings.warn("set_event_loop_policy is deprecated", DeprecationWarning, stacklevel=2)
+            policies.append(policy)
+
+        uvloop = types.SimpleNamespace(EventLoopPolicy=object)
+        monkeypatch.setitem(sys.modules, "uvloop", uvloop)
+        monkeypatch.setattr(asyncio, "set_event_loop_policy", set_policy)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            assert AsyncAgentKernel.enable_uvloop() is True
+        assert len(policies) == 1
@@ -1,5 +1,9 @@
 """Tests for the synchronous AgentKernel client."""
 
+import json
+import weakref
+
+import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 
@@ -9,7 +13,9 @@ from agentkernel import (
     NotFoundError,
     RunOutput,
     SandboxInfo,
+    SandboxSession,
     ServerError,
+    StreamError,
     ValidationError,
 )
 
@@ -26,6 +32,17 @@ class TestHealth:
         assert make_client().health() == "ok"
 
 
+class TestWarmup:
+    def test_primes_connections(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(json={"success": True, "data": "ok"}, is_reusable=True)
+        make_client().warmup(3)
+        assert len(httpx_mock.get_requests()) == 3
+
+    def test_zero_connections_is_a_no_op(self, httpx_mock: HTTPXMock) -> None:
+        make_client().warmup(0)
+        assert httpx_mock.get_requests() == []
+
+
 class TestRun:
     def test_returns_output(self, httpx_mock: HTTPXMock) -> None:
         httpx_mock.add_response(json={"success": True, "data": {"output": "hello\n"}})
@@ -50,6 +67,29 @@ class TestRun:
         assert body["profile"] == "restrictive"
         assert body["fast"] is False
 
+    def test_sends_json_content_type(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(json={"success": True, "data": {"output": "ok\n"}})
+        make_client().run(["true"])
+        request = httpx_mock.get_request()
+        assert request is not None
+        assert request.headers["content-type"] == "application/json"
+        assert str(request.url) == f"{BASE_URL}/run"
+
+
+class TestRunStream:
+    def test_yields_events(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            headers={"Content-Type": "text/event-stream"},
+            content=b'event: output\ndata: {"data":"hi"}\n\nevent: done\ndata: {}\n\n',
+        )
+        events = list(make_client().run_stream(["echo", "hi"]))
+        assert [e.type for e in events] == ["output", "done"]
+
+    def test_rejects_non_event_stream(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(json={"success": True, "data": {"output": "hi"}})
+        with pytest.raises(StreamError, match="text/event-stream"):
+            list(make_client().run_stream(["echo", "hi"]))
+
 
 class TestListSandboxes:
     def test_returns_list(self, httpx_mock: HTTPXMock) -> None:
@@ -98,6 +138,15 @@ class TestRemoveSandbox:
         httpx_mock.add_response(json={"success": True, "data": "Sandbox removed"})
         make_client().remove_sandbox("test")  # no exception
 
+    def test_skips_body_parsing(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(status_code=204)
+        make_client().remove_sandbox("test")
+
+    def test_not_found(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(status_code=404, json={"success": False, "error": "Not found"})
+        with pytest.raises(NotFoundError):
+            make_client().remove_sandbox("missing")
+
 
 class TestExecInSandbox:
     def test_returns_output(self, httpx_mock: HTTPXMock) -> None:
@@ -148,7 +197,7 @@ class TestAuth:
 class TestErrors:
     def test_401(self, httpx_mock: HTTPXMock) -> None:
         httpx_mock.add_response(status_code=401, json={"success": False, "error": "Unauthorized"})
-        with pytest.raises(AuthError):
+        with pytest.raises(AuthError, match="Unauthorized"):
             make_client().health()
 
     def test_400(self, httpx_mock: HTTPXMock) -> None:
@@ -161,6 +210,28 @@ class TestErrors:
         with pytest.raises(ServerError):
             make_client().health()
 
+    def test_non_json_body(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(status_code=502, text="Bad Gateway")
+        with pytest.raises(ServerError, match="Bad Gateway"):
+            make_client().health()
+
+
+class TestTimeout:
+    def test_applies_client_timeout(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(json={"success": True, "data": "ok"})
+        make_client(timeout=5.0).health()
+        request = httpx_mock.get_request()
+        assert request is not None
+        assert request.extensions["timeout"]["read"] == 5.0
+
+
+class TestWeakref:
+    def test_client_and_session_are_weakly_referenceable(self) -> None:
+        client = make_client()
+        assert weakref.ref(client)() is client
+        session = SandboxSession("sb", client)
+        assert weakref.ref(session)() is session
+
 
 class TestUserAgent:
     def test_sends_user_agent(self, httpx_mock: HTTPXMock) -> None:
@@ -169,3 +240,40 @@ class TestUserAgent:
         request = httpx_mock.get_request()
         assert request is not None
         assert request.headers["user-agent"].startswith("agentkernel-python-sdk/")
+
+
+class TestUnixSocket:
+    def test_defaults_base_url_to_localhost(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(json={"success": True, "data": "ok"})
+        assert AgentKernel(uds="/run/agentkernel.sock").health() == "ok"
+        request = httpx_mock.get_request()
+        assert request is not None
+        assert str(request.url) == "http://localhost/health"
+
+    def test_reads_env_var(self, httpx_mock: HTTPXMock, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("AGENTKERNEL_BASE_URL", raising=False)
+        monkeypatch.setenv("AGENTKERNEL_UDS", "/run/agentkernel.sock")
+        httpx_mock.add_response(json={"success": True, "data": "ok"})
+        AgentKernel().health()
+        request = httpx_mock.get_request()
+        assert request is not None
+        assert request.url.host == "localhost"
+        assert request.url.port is None
+
+
+def echo_run(request: httpx.Request) -> httpx.Response:
+    command = json.loads(request.content)["command"]
+    return httpx.Response(200, json={"success": True, "data": {"output": " ".join(command)}})
+
+
+class TestParallelBatchRun:
+    def test_preserves_order(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_callback(echo_run, url=f"{BASE_URL}/run", is_reusable=True)
+        commands = [["echo", str(i)] for i in range(5)]
+        result = make_client().parallel_batch_run(commands, concurrency=2)
+        assert [r.output for r in result] == [f"echo {i}" for i in range(5)]
+        assert len(httpx_mock.get_requests()) == 5
+
+    def test_rejects_zero_concurrency(self) -> None:
+        with pytest.raises(ValueError, match="concurrency"):
+            make_client().parallel_batch_run([["true"]], concurrency=0)
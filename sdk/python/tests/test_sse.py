@@ -0,0 +1,281 @@
+"""Tests for SSE stream parsing."""
+
+import asyncio
+import dataclasses
+import json
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+from pydantic import TypeAdapter
+from pydantic import ValidationError as PydanticValidationError
+
+from agentkernel import StreamEvent
+from agentkernel.sse import (
+    _FrameBuffer,
+    iter_sse_async,
+    iter_sse_async_batched,
+    iter_sse_sync,
+    iter_sse_sync_batched,
+)
+
+
+def make_response(chunks: list[str]) -> httpx.Response:
+    return httpx.Response(200, content=iter(c.encode() for c in chunks))
+
+
+def make_async_response(chunks: list[str]) -> httpx.Response:
+    async def stream() -> AsyncIterator[bytes]:
+        for c in chunks:
+            yield c.encode()
+
+    return httpx.Response(200, content=stream())
+
+
+class TestStreamEvent:
+    def test_is_frozen(self) -> None:
+        event = StreamEvent("output", {"data": "hi"})
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            event.type = "done"  # type: ignore[misc]
+
+    def test_keeps_model_methods(self) -> None:
+        event = StreamEvent.model_validate({"type": "output", "data": {"data": "hi"}})
+        assert event.model_dump() == {"type": "output", "data": {"data": "hi"}}
+        assert json.loads(event.model_dump_json()) == {"type": "output", "data": {"data": "hi"}}
+        assert event.model_copy(update={"type": "done"}) == StreamEvent("done", {"data": "hi"})
+
+    def test_from_raw(self) -> None:
+        assert StreamEvent.from_raw("output", b'{"data":"hi"}').data == {"data": "hi"}
+        assert StreamEvent.from_raw("progress", b"50%").data == {"raw": "50%"}
+
+    def test_validates_with_pydantic(self) -> None:
+        adapter = TypeAdapter(StreamEvent)
+        event = adapter.validate_python({"type": "output", "data": {"data": "hi"}})
+        assert event == StreamEvent("output", {"data": "hi"})
+        assert adapter.dump_python(event) == {"type": "output", "data": {"data": "hi"}}
+        with pytest.raises(PydanticValidationError):
+            adapter.validate_python({"type": "bogus", "data": {}})
+
+
+class TestFrameBuffer:
+    def test_grows_while_previous_payload_is_held(self) -> None:
+        frames = _FrameBuffer(size=64)
+        [(_, held)] = frames.feed(b'event: output\ndata: {"data":"a"}\n\n')
+        big = b"event: output\ndata: " + b"x" * 1000 + b"\n\n"
+        [(_, data)] = frames.feed(big)
+        assert bytes(data) == b"x" * 1000
+        assert isinstance(held, memoryview)
+
+
+class TestIterSSESync:
+    def test_parses_complete_stream(self) -> None:
+        events = list(
+            iter_sse_sync(
+                make_response(
+                    [
+                        'event: started\ndata: {"command":["echo","hello"]}\n\n',
+                        'event: output\ndata: {"data":"hello\\n","stream":"stdout"}\n\n',
+                        'event: done\ndata: {"exit_code":0,"success":true}\n\n',
+                    ]
+                )
+            )
+        )
+        assert [e.type for e in events] == ["started", "output", "done"]
+        assert events[1].data == {"data": "hello\n", "stream": "stdout"}
+
+    def test_stops_on_error_event(self) -> None:
+        events = list(
+            iter_sse_sync(
+                make_response(
+                    [
+                        'event: started\ndata: {"command":["fail"]}\n\n',
+                        'event: error\ndata: {"message":"command failed"}\n\n',
+                        'event: output\ndata: {"data":"should not see this"}\n\n',
+                    ]
+                )
+            )
+        )
+        assert len(events) == 2
+        assert events[1].type == "error"
+
+    def test_handles_chunked_data(self) -> None:
+        events = list(
+            iter_sse_sync(
+                make_response(
+                    [
+                        'event: started\ndata: {"co',
+                        'mmand":["echo"]}\n',
+                        "\nevent: done\n",
+                        'data: {"exit_code":0}\n\n',
+                    ]
+                )
+            )
+        )
+        assert [e.type for e in events] == ["started", "done"]
+        assert events[0].data == {"command": ["echo"]}
+
+    def test_ignores_unknown_event_types(self) -> None:
+        events = list(
+            iter_sse_sync(
+                make_response(
+                    [
+                        "event: unknown\ndata: {}\n\n",
+                        'event: output\ndata: {"data":"hello"}\n\n',
+                        'event: done\ndata: {"exit_code":0}\n\n',
+                    ]
+                )
+            )
+        )
+        assert [e.type for e in events] == ["output", "done"]
+
+    def test_wraps_non_json_data(self) -> None:
+        response = make_response(
+            ["event: progress\ndata: building\n\n", "event: done\ndata: {}\n\n"]
+        )
+        events = list(iter_sse_sync(response))
+        assert events[0].data == {"raw": "building"}
+
+    def test_wraps_non_object_json(self) -> None:
+        response = make_response(['event: progress\ndata: "50%"\n\n', "event: done\ndata: {}\n\n"])
+        events = list(iter_sse_sync(response))
+        assert events[0].data == {"raw": '"50%"'}
+
+    def test_wraps_malformed_json_object(self) -> None:
+        response = make_response(
+            ['event: output\ndata: {"data": \n\n', "event: done\ndata: {}\n\n"]
+        )
+        events = list(iter_sse_sync(response))
+        assert events[0].data == {"raw": '{"data": '}
+
+    def test_event_filter_keeps_terminal_events(self) -> None:
+        response = make_response(
+            [
+                'event: started\ndata: {"command":["echo"]}\n\n',
+                "event: progress\ndata: not json\n\n",
+                'event: output\ndata: {"data":"hi"}\n\n',
+                'event: done\ndata: {"exit_code":0}\n\n',
+            ]
+        )
+        events = list(iter_sse_sync(response, event_filter=frozenset({"output"})))
+        assert [e.type for e in events] == ["output", "done"]
+
+    def test_event_filter_rejects_bare_string(self) -> None:
+        response = make_response(["event: done\ndata: {}\n\n"])
+        with pytest.raises(TypeError, match="event_filter"):
+            list(iter_sse_sync(response, event_filter="output"))  # type: ignore[arg-type]
+
+    def test_parses_multiline_frames(self) -> None:
+        response = make_response(
+            [
+                'data: {"data":\ndata: "b"}\nevent: output\n\n',
+                "event: done\ndata: {}\n\n",
+            ]
+        )
+        events = list(iter_sse_sync(response))
+        assert [e.data for e in events] == [{"data": "b"}, {}]
+
+    def test_parses_crlf_frames(self) -> None:
+        response = make_response(
+            [
+                'event: output\r\ndata: {"data":"a"}\r\n\r\nevent: output\r',
+                '\ndata: {"data":"b"}\r\n\r',
+                '\nevent: done\r\ndata: {"exit_code":0}\r\n\r\n',
+            ]
+        )
+        events = list(iter_sse_sync(response))
+        assert [e.type for e in events] == ["output", "output", "done"]
+        assert [e.data for e in events] == [{"data": "a"}, {"data": "b"}, {"exit_code": 0}]
+
+    def test_parses_cr_frames(self) -> None:
+        response = make_response(['event: output\rdata: {"data":"a"}\r\revent: done\rdata: {}\r\r'])
+        events = list(iter_sse_sync(response))
+        assert [e.data for e in events] == [{"data": "a"}, {}]
+
+    def test_handles_frames_larger_than_buffer(self) -> None:
+        big = "x" * 100_000
+        frame = f'event: output\ndata: {{"data":"{big}"}}\n\n'
+        chunks = [frame[i : i + 8192] for i in range(0, len(frame), 8192)]
+        events = list(iter_sse_sync(make_response([*chunks, "event: done\ndata: {}\n\n"])))
+        assert events[0].data == {"data": big}
+        assert events[1].type == "done"
+
+
+class TestIterSSESyncBatched:
+    def test_groups_events_by_chunk(self) -> None:
+        response = make_response(
+            [
+                'event: started\ndata: {}\n\nevent: output\ndata: {"data":"a"}\n\n',
+                'event: output\ndata: {"data":"b"}\n\nevent: done\ndata: {}\n\n',
+            ]
+        )
+        batches = list(iter_sse_sync_batched(response))
+        assert [[e.type for e in b] for b in batches] == [["started", "output"], ["output", "done"]]
+
+    def test_caps_batch_size(self) -> None:
+        frames = "".join(f'event: output\ndata: {{"data":"{i}"}}\n\n' for i in range(5))
+        response = make_response([frames + "event: done\ndata: {}\n\n"])
+        batches = list(iter_sse_sync_batched(response, max_batch=2))
+        assert [len(b) for b in batches] == [2, 2, 2]
+        assert batches[-1][-1].type == "done"
+
+
+class TestIterSSEAsync:
+    async def test_parses_chunked_stream(self) -> None:
+        response = make_async_response(
+            [
+                'event: started\ndata: {"command":["echo"]}\n\nevent: out',
+                'put\ndata: {"data":"hi"}\n\n',
+                'event: done\ndata: {"exit_code":0}\n\n',
+            ]
+        )
+        events = [e async for e in iter_sse_async(response)]
+        assert [e.type for e in events] == ["started", "output", "done"]
+        assert events[1].data == {"data": "hi"}
+
+    async def test_batched_stops_on_error_event(self) -> None:
+        response = make_async_response(
+            [
+                'event: output\ndata: {"data":"hi"}\n\nevent: error\ndata: {"message":"x"}\n\n',
+                'event: output\ndata: {"data":"should not see this"}\n\n',
+            ]
+        )
+        batches = [b async for b in iter_sse_async_batched(response)]
+        assert [[e.type for e in b] for b in batches] == [["output", "error"]]
+
+    async def test_without_prefetch(self) -> None:
+        response = make_async_response(
+            ['event: output\ndata: {"data":"hi"}\n\n', "event: done\ndata: {}\n\n"]
+        )
+        events = [e async for e in iter_sse_async(response, prefetch=0)]
+        assert [e.type for e in events] == ["output", "done"]
+
+    async def test_close_stops_prefetch_and_closes_response(self) -> None:
+        async def endless() -> AsyncIterator[bytes]:
+            while True:
+                yield b'event: output\ndata: {"data":"x"}\n\n'
+                await asyncio.sleep(0)
+
+        response = httpx.Response(200, content=endless())
+        events = iter_sse_async(response)
+        assert (await anext(events)).type == "output"
+        await events.aclose()
+        assert response.is_closed
+
+    async def test_prefetch_propagates_read_errors(self) -> None:
+        async def broken() -> AsyncIterator[bytes]:
+            yield b'event: output\ndata: {"data":"x"}\n\n'
+            raise httpx.ReadError("connection reset")
+
+        response = httpx.Response(200, content=broken())
+        seen = []
+        with pytest.raises(httpx.ReadError):
+            async for event in iter_sse_async(response):
+                seen.append(event.type)
+        assert seen == ["output"]
+
+    async def test_parses_cr_frames(self) -> None:
+        response = make_async_response(
+            ['event: output\rdata: {"data":"a"}\r\r', "event: done\rdata: {}\r\r"]
+        )
+        events = [e async for e in iter_sse_async(response)]
+        assert [e.type for e in events] == ["output", "done"]